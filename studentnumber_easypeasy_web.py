@@ -1,11 +1,17 @@
 import streamlit as st
 import json
 import pandas as pd
-from io import BytesIO
+import numpy as np
+from io import BytesIO, BufferedWriter
 import uuid
 import os
 import logging
 
+try:
+    import orjson  # 설치되어 있으면 더 빠른 JSON 처리에 사용
+except ImportError:
+    orjson = None
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -16,7 +22,11 @@ st.set_page_config(page_title="예상학생수왕초보만", layout="centered")
 # 상수 정의
 YIELD_RATE_FILE = "student_yield_rate.json"
 HIGH_SCHOOL_YIELD_RATE_FILE = "high_school_yield_rate.json"
+JSON_BUFFER_SIZE = 1 << 18  # JSON 파일 입출력 버퍼 크기 (256 KB)
+XLSX_BUFFER_SIZE = 1 << 18  # 엑셀 생성 시 작은 쓰기를 모으는 버퍼 크기 (256 KB)
 VERSION = "v1.1.1(2025. 5. 7.)"  # 버전 상수 추가
+RESULT_TEXT_COLUMNS = ["시", "지역", "주택유형", "공급유형", "주택규모"]
+RESULT_COUNT_COLUMNS = ["세대수", "유치원생", "초등학생", "중학생", "고등학생"]
 
 # 숫자 포맷팅 함수
 def format_number(number):
@@ -27,14 +37,20 @@ def format_percentage(number):
     """퍼센트를 소수점 둘째 자리로 포맷팅"""
     return f"{number:.2f}"
 
+# JSON 파일 파싱 (성공한 결과만 세션 간 공유, 실패 시 예외는 캐시되지 않음)
+@st.cache_resource
+def read_json_file(path):
+    with open(path, "rb", buffering=JSON_BUFFER_SIZE) as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
 # JSON 파일 로드 함수
 def load_json(path):
     try:
         if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                logger.info(f"성공적으로 {path} 파일 로드")
-                return data
+            data = read_json_file(path)
+            logger.info(f"성공적으로 {path} 파일 로드")
+            return data
         else:
             st.warning(f"⚠️ 파일이 없습니다: {path}. 기본값으로 초기화합니다.")
             logger.warning(f"{path} 파일이 존재하지 않음")
@@ -46,33 +62,101 @@ def load_json(path):
 
 # JSON 파일 저장 함수
 def save_json(path, data):
+    tmp_path = f"{path}.tmp"
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            f.flush()  # 즉시 디스크에 쓰기
-            os.fsync(f.fileno())  # 파일 시스템 동기화
+        if orjson:
+            raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            raw = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        with open(tmp_path, "wb", buffering=JSON_BUFFER_SIZE) as f:
+            f.write(raw)  # 한 번에 직렬화 후 쓰기
+        os.replace(tmp_path, path)  # 원자적 교체로 중간에 깨진 파일 방지
         logger.info(f"성공적으로 {path} 파일 저장")
-        # 저장 후 파일 다시 읽어 확인
-        with open(path, "r", encoding="utf-8") as f:
-            saved_data = json.load(f)
-            if saved_data == data:
-                logger.info(f"{path} 파일 저장 확인 완료")
-            else:
-                logger.error(f"{path} 파일 저장 불일치")
-                st.error(f"❌ {path} 파일 저장 불일치")
     except Exception as e:
         st.error(f"❌ 파일 저장 실패: {path}, 에러: {e}")
         logger.error(f"{path} 파일 저장 실패: {e}")
 
+# 발생률 정보는 처음 사용할 때 불러옴
+def get_rates():
+    if "rates" not in st.session_state:
+        st.session_state.rates = load_json(YIELD_RATE_FILE)
+    return st.session_state.rates
+
+def get_high_school_rates():
+    if "high_school_rates" not in st.session_state:
+        st.session_state.high_school_rates = load_json(HIGH_SCHOOL_YIELD_RATE_FILE)
+    return st.session_state.high_school_rates
+
+def flatten_rates(rates):
+    """중첩된 발생률 정보를 (지역, 주택유형, 공급유형, 주택규모) 키 하나로 펼침"""
+    return {
+        (r, t, s, sc): v
+        for r, types in rates.items()
+        for t, subtypes in types.items()
+        for s, scales in subtypes.items()
+        for sc, v in scales.items()
+    }
+
+# 계산용 평탄화 발생률 정보 (한 번의 키 조회로 접근)
+def get_rates_flat():
+    if "rates_flat" not in st.session_state:
+        st.session_state.rates_flat = flatten_rates(get_rates())
+    return st.session_state.rates_flat
+
+def get_high_school_rates_flat():
+    if "high_school_rates_flat" not in st.session_state:
+        st.session_state.high_school_rates_flat = flatten_rates(get_high_school_rates())
+    return st.session_state.high_school_rates_flat
+
+def make_rates_df(rates_flat, high_school_rates_flat):
+    """평탄화된 발생률 정보를 열 단위 표로 변환 (고등 정보가 없으면 NaN)"""
+    rows = []
+    for key, v in rates_flat.items():
+        hs = high_school_rates_flat.get(key)
+        rows.append(
+            (
+                key[0].split(" ", 1)[0],
+                *key,
+                v.get("초등", 0.0),
+                v.get("중등", 0.0),
+                hs.get("인원", 0.0) if hs else np.nan,
+                hs.get("발생률", 0.0) if hs else np.nan,
+            )
+        )
+    rates_df = pd.DataFrame(
+        rows,
+        columns=["시", "지역", "주택유형", "공급유형", "주택규모", "초등", "중등", "인원", "발생률"],
+    )
+    category_cols = ["시", "지역", "주택유형", "공급유형", "주택규모"]
+    rates_df[category_cols] = rates_df[category_cols].astype("category")
+    return rates_df
+
+# 드롭다운·표·일괄 계산에 함께 쓰는 발생률 표
+def get_rates_df():
+    if "rates_df" not in st.session_state:
+        st.session_state.rates_df = make_rates_df(get_rates_flat(), get_high_school_rates_flat())
+    return st.session_state.rates_df
+
+# 계산 결과 누적 표
+def empty_results_df():
+    return pd.DataFrame(
+        {col: pd.Series(dtype="object") for col in RESULT_TEXT_COLUMNS}
+        | {col: pd.Series(dtype="int64") for col in RESULT_COUNT_COLUMNS}
+    )
+
+def append_results(new_results_df):
+    """새 계산 결과만 기존 표 뒤에 이어 붙임"""
+    results_df = st.session_state.calculated_results_df
+    if results_df.empty:
+        st.session_state.calculated_results_df = new_results_df.reset_index(drop=True)
+    else:
+        st.session_state.calculated_results_df = pd.concat([results_df, new_results_df], ignore_index=True)
+
 # 세션 상태 초기화
-if "rates" not in st.session_state:
-    st.session_state.rates = load_json(YIELD_RATE_FILE)
-if "high_school_rates" not in st.session_state:
-    st.session_state.high_school_rates = load_json(HIGH_SCHOOL_YIELD_RATE_FILE)
 if "units_inputted" not in st.session_state:
     st.session_state.units_inputted = 0
-if "calculated_results" not in st.session_state:
-    st.session_state.calculated_results = []
+if "calculated_results_df" not in st.session_state:
+    st.session_state.calculated_results_df = empty_results_df()
 
 # 스타일 정의
 gradient_text_style = """
@@ -112,50 +196,32 @@ gradient_text_style = """
 </style>
 """
 
-# 데이터 접근 유틸리티
-def get_node(data, path, default=None):
-    node = data
-    for key in path:
-        if isinstance(node, dict) and key in node:
-            node = node[key]
-        else:
-            return default
-    return node
-
-def set_node(data, path, value):
-    node = data
-    for key in path[:-1]:
-        node = node.setdefault(key, {})
-    node[path[-1]] = value
-
-# 드롭다운 함수들
-def get_cities():
-    return sorted(
-        list({
-            region.split(" ")[0]
-            for region in st.session_state.rates.keys()
-            if isinstance(st.session_state.rates[region], dict)
-        })
-    )
+# 드롭다운 함수들 (범주형 열 필터라 캐시 없이 바로 계산)
+def get_cities(rates_df):
+    return rates_df["시"].cat.categories.tolist()
 
-def get_regions(city):
-    return sorted([r for r in st.session_state.rates.keys() if r.startswith(city)])
+def get_regions(rates_df, city):
+    return sorted(rates_df.loc[rates_df["시"] == city, "지역"].unique().tolist())
 
-def get_types(region):
-    return sorted(st.session_state.rates.get(region, {}).keys())
+def get_types(rates_df, region):
+    return sorted(rates_df.loc[rates_df["지역"] == region, "주택유형"].unique().tolist())
 
-def get_subtypes(region, housing_type):
-    return sorted(
-        st.session_state.rates.get(region, {}).get(housing_type, {}).keys()
-    )
+def get_subtypes(rates_df, region, housing_type):
+    mask = (rates_df["지역"] == region) & (rates_df["주택유형"] == housing_type)
+    return sorted(rates_df.loc[mask, "공급유형"].unique().tolist())
 
-def get_scales(region, housing_type, subtype):
-    return sorted(
-        st.session_state.rates.get(region, {})
-        .get(housing_type, {})
-        .get(subtype, {})
-        .keys()
+def get_scales(rates_df, region, housing_type, subtype):
+    mask = (
+        (rates_df["지역"] == region)
+        & (rates_df["주택유형"] == housing_type)
+        & (rates_df["공급유형"] == subtype)
     )
+    return sorted(rates_df.loc[mask, "주택규모"].unique().tolist())
+
+# 학생 수 반올림 (배열 단위)
+def round_counts(values):
+    """np.rint로 한 번에 정수 반올림 (파이썬 round와 같은 오사오입 방식)"""
+    return np.rint(values).astype(np.int64)
 
 # 학생 수 계산
 def calculate_student_counts(city, region, housing_type, subtype, scale, units, tab):
@@ -166,12 +232,13 @@ def calculate_student_counts(city, region, housing_type, subtype, scale, units,
         tab.warning("⚠️ 세대 수는 1 이상이어야 합니다!")
         return
 
-    data = get_node(st.session_state.rates, [region, housing_type, subtype, scale], {})
+    key = (region, housing_type, subtype, scale)
+    data = get_rates_flat().get(key, {})
     if not data:
         tab.warning("⚠️ 해당 조합의 학생 발생률이 설정되지 않았습니다!")
         return
 
-    high_school_data = get_node(st.session_state.high_school_rates, [region, housing_type, subtype, scale], {})
+    high_school_data = get_high_school_rates_flat().get(key, {})
     if not high_school_data:
         tab.warning("⚠️ 해당 조합의 고등-학생 점유율이 설정되지 않았습니다!")
         return
@@ -204,27 +271,93 @@ def calculate_student_counts(city, region, housing_type, subtype, scale, units,
     tab.markdown(calculation_basis)
 
     # 계산 결과 세션에 저장
-    if "calculated_results" not in st.session_state:
-        st.session_state.calculated_results = []
-    st.session_state.calculated_results.append(
-        {
-            "시": city,
-            "지역": region,
-            "주택유형": housing_type,
-            "공급유형": subtype,
-            "주택규모": scale,
-            "세대수": units,
-            "유치원생": k,
-            "초등학생": e,
-            "중학생": m,
-            "고등학생": h,
-        }
+    append_results(
+        pd.DataFrame(
+            [
+                {
+                    "시": city,
+                    "지역": region,
+                    "주택유형": housing_type,
+                    "공급유형": subtype,
+                    "주택규모": scale,
+                    "세대수": units,
+                    "유치원생": k,
+                    "초등학생": e,
+                    "중학생": m,
+                    "고등학생": h,
+                }
+            ]
+        )
     )
 
+# 엑셀 일괄 계산
+def calculate_bulk_student_counts(file, tab):
+    try:
+        required_cols = {"시", "지역", "주택유형", "공급유형", "주택규모", "세대수"}
+        df = pd.read_excel(
+            file,
+            usecols=lambda col: col in required_cols,
+            dtype={
+                "시": "string",
+                "지역": "string",
+                "주택유형": "string",
+                "공급유형": "string",
+                "주택규모": "string",
+                "세대수": "float64",
+            },
+        )
+        if not required_cols.issubset(df.columns):
+            tab.error("❌ 엑셀에 필수 열(시, 지역, 주택유형, 공급유형, 주택규모, 세대수)이 부족합니다.")
+            return
+
+        total = len(df)
+        key_cols = ["지역", "주택유형", "공급유형", "주택규모"]
+        # 계산하기와 같이 1 이상의 정수 세대수만 계산 (소수는 제외)
+        df = df[(df["세대수"] > 0) & (df["세대수"] % 1 == 0)].copy()
+        df[["시", "주택유형", "공급유형", "주택규모"]] = df[["시", "주택유형", "공급유형", "주택규모"]].fillna("nan")
+        df["지역"] = df["시"] + " " + df["지역"].fillna("nan")
+
+        rates_df = get_rates_df().drop(columns=["시"])
+        rates_df[key_cols] = rates_df[key_cols].astype("string")
+        merged = df.merge(rates_df, on=key_cols, how="inner").dropna(subset=["초등", "중등", "인원", "발생률"])
+        skipped = total - len(merged)
+        if merged.empty:
+            tab.warning("⚠️ 학생 발생률 또는 고등-학생 점유율이 설정된 조합이 없습니다!")
+            return
+
+        units_arr = merged["세대수"].to_numpy(dtype=np.int64)
+        e = round_counts(units_arr * merged["초등"].to_numpy() / 100)
+        k = round_counts(e * 0.5)
+        m = round_counts(units_arr * merged["중등"].to_numpy() / 100)
+        h = round_counts(units_arr * merged["인원"].to_numpy() * merged["발생률"].to_numpy() / 100)
+
+        result_df = pd.DataFrame(
+            {
+                "시": merged["시"],
+                "지역": merged["지역"],
+                "주택유형": merged["주택유형"],
+                "공급유형": merged["공급유형"],
+                "주택규모": merged["주택규모"],
+                "세대수": units_arr,
+                "유치원생": k,
+                "초등학생": e,
+                "중학생": m,
+                "고등학생": h,
+            }
+        ).astype({col: "object" for col in RESULT_TEXT_COLUMNS})
+        append_results(result_df)
+
+        tab.success(f"✅ {format_number(len(result_df))}개 조합 일괄 계산 완료! '📊 계산 결과 누적' 탭에서 확인해주세요.")
+        if skipped:
+            tab.warning(f"⚠️ 발생률이 설정되지 않았거나 세대 수가 1 이상의 정수가 아닌 {format_number(skipped)}개 조합은 제외했습니다.")
+        logger.info(f"엑셀 일괄 계산 완료: {len(result_df)}개 조합")
+    except Exception as e:
+        tab.error(f"❌ 엑셀 일괄 계산 실패: {e}")
+        logger.error(f"엑셀 일괄 계산 실패: {e}")
+
 # 엑셀 처리
 def process_excel(file, tab):
     try:
-        df = pd.read_excel(file)
         required_cols = {
             "시",
             "지역",
@@ -236,42 +369,63 @@ def process_excel(file, tab):
             "고등-세대당 인구수",
             "고등-학생 점유율",
         }
+        df = pd.read_excel(
+            file,
+            usecols=lambda col: col in required_cols,
+            dtype={
+                "시": "string",
+                "지역": "string",
+                "주택유형": "string",
+                "공급유형": "string",
+                "주택규모": "string",
+                "초등": "float64",
+                "중등": "float64",
+                "고등-세대당 인구수": "float64",
+                "고등-학생 점유율": "float64",
+            },
+        )
         if not required_cols.issubset(df.columns):
             tab.error(
                 "❌ 엑셀에 필수 열(시, 지역, 주택유형, 공급유형, 주택규모, 초등, 중등, 고등-세대당 인구수, 고등-학생 점유율)이 부족합니다."
             )
             return
 
+        # 열 단위로 한 번에 변환 (빈 칸은 기존과 같이 "nan"으로 처리)
+        text_cols = ["시", "지역", "주택유형", "공급유형", "주택규모"]
+        df[text_cols] = df[text_cols].fillna("nan")
+        df["full_region"] = df["시"] + " " + df["지역"]
+        key_cols = ["full_region", "주택유형", "공급유형", "주택규모"]
+        rate_cols = ["초등", "중등"]
+        hs_cols = ["고등-세대당 인구수", "고등-학생 점유율"]
+        has_high_school = df[hs_cols].notna().all(axis=1)
+
         new_rates = {}
         new_high_school_rates = {}
-        for _, row in df.iterrows():
-            city, r, h, s, sc = (
-                str(row["시"]),
-                str(row["지역"]),
-                str(row["주택유형"]),
-                str(row["공급유형"]),
-                str(row["주택규모"]),
-            )
-            full_region = f"{city} {r}"
-            e, m = round(float(row["초등"]), 2), round(float(row["중등"]), 2)
-            new_rates.setdefault(full_region, {})
-            new_rates[full_region].setdefault(h, {})
-            new_rates[full_region][h].setdefault(s, {})[sc] = {"초등": e, "중등": m}
-
-            high_school_personnel = row.get("고등-세대당 인구수")
-            high_school_rate = row.get("고등-학생 점유율")
-
-            if pd.notna(high_school_personnel) and pd.notna(high_school_rate) and high_school_personnel != "" and high_school_rate != "":
-                new_high_school_rates.setdefault(full_region, {})
-                new_high_school_rates[full_region].setdefault(h, {})
-                new_high_school_rates[full_region][h].setdefault(s, {})[sc] = {
-                    "인원": round(float(high_school_personnel), 2),
-                    "발생률": round(float(high_school_rate), 2),
+        new_rates_flat = {}
+        new_high_school_rates_flat = {}
+        for (full_region, h, s, sc), (e, m), hs_ok, (high_school_personnel, high_school_rate) in zip(
+            df[key_cols].itertuples(index=False, name=None),
+            df[rate_cols].itertuples(index=False, name=None),
+            has_high_school,
+            df[hs_cols].itertuples(index=False, name=None),
+        ):
+            rate = {"초등": round(e, 2), "중등": round(m, 2)}
+            new_rates.setdefault(full_region, {}).setdefault(h, {}).setdefault(s, {})[sc] = rate
+            new_rates_flat[(full_region, h, s, sc)] = rate
+            if hs_ok:
+                high_school_data = {
+                    "인원": round(high_school_personnel, 2),
+                    "발생률": round(high_school_rate, 2),
                 }
+                new_high_school_rates.setdefault(full_region, {}).setdefault(h, {}).setdefault(s, {})[sc] = high_school_data
+                new_high_school_rates_flat[(full_region, h, s, sc)] = high_school_data
 
         # 수정된 코드 (메모리에만 반영하고 저장 X)
         st.session_state.rates = new_rates
         st.session_state.high_school_rates = new_high_school_rates
+        st.session_state.rates_flat = new_rates_flat
+        st.session_state.high_school_rates_flat = new_high_school_rates_flat
+        st.session_state.rates_df = make_rates_df(new_rates_flat, new_high_school_rates_flat)
 
         tab.success(f"✅ {format_number(len(df))}개 조합 저장 및 업데이트 완료!")
         logger.info(f"엑셀 파일 처리 완료: {len(df)}개 조합")
@@ -282,23 +436,52 @@ def process_excel(file, tab):
 # 엑셀 다운로드 변환
 def to_excel(df):
     output = BytesIO()
+    buffer = BufferedWriter(output, buffer_size=XLSX_BUFFER_SIZE)
     try:
-        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        # 임시 파일 없이 메모리에서 바로 생성 (constant_memory는 pandas의 열 단위 쓰기와 호환되지 않음)
+        with pd.ExcelWriter(
+            buffer,
+            engine="xlsxwriter",
+            engine_kwargs={"options": {"in_memory": True, "strings_to_numbers": False}},
+        ) as writer:
             df.to_excel(writer, index=False, sheet_name="Sheet1")
             workbook = writer.book
             worksheet = writer.sheets["Sheet1"]
             format1 = workbook.add_format({"num_format": "0.00"})
-            cols_to_format = ["초등", "중등", "고등-세대당 인구수", "고등-학생 점유율"]
-            for col_num, col_name in enumerate(df.columns):
-                if col_name in cols_to_format:
-                    column_letter = chr(ord("A") + col_num)
-                    worksheet.set_column(f"{column_letter}:{column_letter}", None, format1)
+            cols_to_format = {"초등", "중등", "고등-세대당 인구수", "고등-학생 점유율"}
+            cols_to_format_idx = [i for i, c in enumerate(df.columns) if c in cols_to_format]
+            for col_num in cols_to_format_idx:
+                worksheet.set_column(col_num, col_num, None, format1)
+        buffer.flush()
         return output.getvalue()
     except Exception as e:
         st.error(f"❌ 엑셀 파일 생성 실패: {e}")
         logger.error(f"엑셀 파일 생성 실패: {e}")
         return None
 
+# 발생률 표 생성 (캐시)
+@st.cache_data(max_entries=2)
+def build_rate_df(rates_df):
+    """발생률 표를 화면 표시 및 엑셀 다운로드 형식으로 변환"""
+    return pd.DataFrame(
+        {
+            "시": rates_df["시"].astype(str),
+            "지역": rates_df["지역"].astype(str).str.split(" ", n=1).str[-1],
+            "주택유형": rates_df["주택유형"].astype(str),
+            "공급유형": rates_df["공급유형"].astype(str),
+            "주택규모": rates_df["주택규모"].astype(str),
+            "초등": rates_df["초등"].map(format_percentage),
+            "중등": rates_df["중등"].map(format_percentage),
+            "고등-세대당 인구수": rates_df["인원"].fillna(0.0).map(format_percentage),
+            "고등-학생 점유율": rates_df["발생률"].fillna(0.0).map(format_percentage),
+        }
+    )
+
+@st.cache_data(max_entries=2)
+def build_rate_excel(rates_df):
+    """발생률 정보가 바뀔 때만 엑셀 바이트 생성"""
+    return to_excel(build_rate_df(rates_df))
+
 # 메인 실행
 def main():
     st.markdown(gradient_text_style, unsafe_allow_html=True)
@@ -318,6 +501,7 @@ def main():
         """
         🏹 **기능**
         - 시, 지역, 주택유형 등 조건에 따른 예상 학생 수를 빠르고 간편하게 계산할 수 있습니다.
+        - 여러 조건을 엑셀 파일로 올려 한 번에 계산할 수도 있습니다. (2번째 탭 하단 '엑셀 일괄 계산')
 
         💁 **사용 순서 및 방법**
         1.  (처음 사용 시) 4번째 탭 하단에 위치한 '기존 정보 다운로드'를 눌러 다운받아주세요.
@@ -340,17 +524,18 @@ def main():
     calc_tab.markdown('<p class="tab-header-style">🧮 예상 학생 수</p>', unsafe_allow_html=True)
     calc_tab.info("①시 ②지역 ③주택유형 ④공급유형 ⑤주택규모 ⑥세대 수 → '계산하기' 클릭 또는 Enter")
 
+    rates_df = get_rates_df()
     col1, col2 = calc_tab.columns(2)
-    city = col1.selectbox("시 선택", get_cities(), key="c_city")
-    region = col2.selectbox("지역 선택", get_regions(city), key="c_region", disabled=not city)
+    city = col1.selectbox("시 선택", get_cities(rates_df), key="c_city")
+    region = col2.selectbox("지역 선택", get_regions(rates_df, city), key="c_region", disabled=not city)
 
     col3, col4 = calc_tab.columns(2)
     housing_type = col3.selectbox(
-        "주택유형 선택", get_types(region), key="c_type", disabled=not region
+        "주택유형 선택", get_types(rates_df, region), key="c_type", disabled=not region
     )
     subtype = col4.selectbox(
         "공급유형 선택",
-        get_subtypes(region, housing_type),
+        get_subtypes(rates_df, region, housing_type),
         key="c_subtype",
         disabled=not housing_type,
     )
@@ -358,7 +543,7 @@ def main():
     col5, col6 = calc_tab.columns(2)
     scale = col5.selectbox(
         "주택규모 선택",
-        get_scales(region, housing_type, subtype),
+        get_scales(rates_df, region, housing_type, subtype),
         key="c_scale",
         disabled=not subtype,
     )
@@ -395,9 +580,18 @@ def main():
         else:
             calc_tab.error("❌ 계산에 필요한 모든 값을 입력해주세요.")
 
+    calc_tab.subheader("📤 엑셀 일괄 계산")
+    calc_tab.caption("시, 지역, 주택유형, 공급유형, 주택규모, 세대수 열이 있는 엑셀을 올리면 한 번에 계산합니다.")
+    bulk_file = calc_tab.file_uploader("일괄 계산용 엑셀 업로드", type=["xlsx"], key="bulk_file")
+    if bulk_file and st.session_state.get("last_bulk_file_id") != bulk_file.file_id:
+        with st.spinner("엑셀 일괄 계산 중..."):
+            calculate_bulk_student_counts(bulk_file, calc_tab)
+        st.session_state["last_bulk_file_id"] = bulk_file.file_id
+
     # 3. 결과 탭
     result_tab.markdown('<p class="tab-header-style">📊 계산 결과 누적</p>', unsafe_allow_html=True)
-    if "calculated_results" not in st.session_state or not st.session_state.calculated_results:
+    results_df = st.session_state.calculated_results_df
+    if results_df.empty:
         result_tab.info("'🧮 예상 학생 수' 탭에서 계산을 먼저 진행해주세요.")
     else:
         result_tab.info("✅ 계산 결과를 확인하고, 필요한 경우 삭제할 수 있습니다.")
@@ -405,28 +599,18 @@ def main():
             '<div style="text-align: right; font-size: 0.8em;">(단위: 세대, 명)</div>',
             unsafe_allow_html=True,
         )
-        result_df = pd.DataFrame(st.session_state.calculated_results)
-        result_df = result_df[
-            ["시", "지역", "주택유형", "공급유형", "주택규모", "세대수", "유치원생", "초등학생", "중학생", "고등학생"]
-        ]
-        # Apply formatting to numeric columns
-        result_df["세대수"] = result_df["세대수"].apply(format_number)
-        result_df["유치원생"] = result_df["유치원생"].apply(format_number)
-        result_df["초등학생"] = result_df["초등학생"].apply(format_number)
-        result_df["중학생"] = result_df["중학생"].apply(format_number)
-        result_df["고등학생"] = result_df["고등학생"].apply(format_number)
-        result_tab.dataframe(result_df, use_container_width=True, hide_index=True)
-
-        options = [f"{format_number(i+1)} 번째 줄" for i in range(len(st.session_state.calculated_results))]
+        # 숫자 열은 표시할 때만 회계 서식 적용
+        result_tab.dataframe(
+            results_df.style.format({col: "{:,}" for col in RESULT_COUNT_COLUMNS}),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        options = [f"{format_number(i+1)} 번째 줄" for i in range(len(results_df))]
         selected_indices = result_tab.multiselect("삭제할 계산 결과 선택", options)
         if result_tab.button("🗑️ 선택한 결과 삭제"):
             original_indices = [int(option.split()[0].replace(",", "")) - 1 for option in selected_indices]
-            new_results = [
-                result
-                for i, result in enumerate(st.session_state.calculated_results)
-                if i not in original_indices
-            ]
-            st.session_state.calculated_results = new_results
+            st.session_state.calculated_results_df = results_df.drop(index=original_indices).reset_index(drop=True)
             result_tab.success("✅ 선택한 계산 결과를 삭제했습니다.")
             st.rerun()
 
@@ -459,9 +643,10 @@ div[data-testid="stFileUploader"] {
     )
 
     excel_file = rate_tab.file_uploader(label="", type=["xlsx"])
-    if excel_file:
+    if excel_file and st.session_state.get("last_rate_file_id") != excel_file.file_id:
         with st.spinner("엑셀 파일 처리 중..."):
             process_excel(excel_file, rate_tab)
+        st.session_state["last_rate_file_id"] = excel_file.file_id
 
     rate_tab.subheader("📊 저장된 학생 발생률 정보")
     rate_tab.markdown(
@@ -469,46 +654,12 @@ div[data-testid="stFileUploader"] {
         unsafe_allow_html=True,
     )
 
-    rate_data = [
-        {
-            "시": r.split(" ")[0] if " " in r else r,
-            "지역": r.split(" ")[1] if " " in r else r,
-            "주택유형": t,
-            "공급유형": s,
-            "주택규모": sc,
-            "초등": format_percentage(v.get("초등", 0.0)),
-            "중등": format_percentage(v.get("중등", 0.0)),
-            "고등-세대당 인구수": format_percentage(st.session_state.high_school_rates.get(r, {})
-                .get(t, {})
-                .get(s, {})
-                .get(sc, {})
-                .get("인원", 0.0))
-                if st.session_state.high_school_rates.get(r, {})
-                .get(t, {})
-                .get(s, {})
-                .get(sc, {})
-                else "0.00",
-            "고등-학생 점유율": format_percentage(st.session_state.high_school_rates.get(r, {})
-                .get(t, {})
-                .get(s, {})
-                .get(sc, {})
-                .get("발생률", 0.0))
-                if st.session_state.high_school_rates.get(r, {})
-                .get(t, {})
-                .get(s, {})
-                .get(sc, {})
-                else "0.00",
-        }
-        for r, types in st.session_state.rates.items()
-        for t, subtypes in types.items()
-        for s, scales in subtypes.items()
-        for sc, v in scales.items()
-    ]
-    rate_df = pd.DataFrame(rate_data)
+    rates_df = get_rates_df()  # 방금 업로드한 정보가 있으면 반영
+    rate_df = build_rate_df(rates_df)
     rate_tab.dataframe(rate_df, use_container_width=True, hide_index=True)
     rate_tab.markdown("<br>", unsafe_allow_html=True)
 
-    excel_data = to_excel(rate_df)
+    excel_data = build_rate_excel(rates_df)
     if excel_data:
         rate_tab.download_button(
             label="💾 기존 정보 다운로드",